@@ -5,6 +5,10 @@ __version__ = "05/22/2025"
 import pygame
 import random
 import math
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+from numba import njit
 
 # Initialize Pygame
 pygame.init()
@@ -13,25 +17,68 @@ game_over = False
 # Set up the game window
 WINDOW_WIDTH = 1620
 WINDOW_HEIGHT = 1100
-window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+# SCALED presents the frame through the SDL2 renderer (uploaded and scaled as a
+# texture) so vsync can be used; blits onto the window are still software blits
+window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SCALED, vsync=1)
 pygame.display.set_caption("Space Simulator")
 
 # Camera and world settings
 WORLD_SCALE = 100000  # Scale factor for world coordinates
 G = 6.67430e-11 * 10  # Increased gravitational constant
 TIME_STEP = 100  # Simulation time step in seconds
-CAMERA_ZOOM = 1.0  # Initial zoom level
+
+# Discrete zoom levels, four steps per doubling from roughly 0.1x to 10x
+ZOOM_LEVELS = tuple(2 ** (i / 4.0) for i in range(-13, 14))
+DEFAULT_ZOOM_LEVEL = 13  # Index of 1.0x
+zoom_level = DEFAULT_ZOOM_LEVEL
+CAMERA_ZOOM = ZOOM_LEVELS[zoom_level]  # Current zoom factor
 
 # Pre-compute values
 HALF_WIDTH = WINDOW_WIDTH // 2
 HALF_HEIGHT = WINDOW_HEIGHT // 2
 
+# Sine and cosine for every whole-degree ship heading
+SIN_DEG = tuple(math.sin(math.radians(a)) for a in range(360))
+COS_DEG = tuple(math.cos(math.radians(a)) for a in range(360))
+
 # Generate stars once at startup
 star_count = 1000
 stars = [(random.randint(0, WINDOW_WIDTH),
           random.randint(0, WINDOW_HEIGHT),
           random.randint(100, 255)) for _ in range(star_count)]
 
+# Sort by brightness so stars sharing a glyph are blitted back to back
+stars.sort(key=lambda star: star[2])
+
+
+@lru_cache(maxsize=None)
+def star_glyph(brightness, size):
+    # Pre-drawn star sprite, shared by every star of the same brightness
+    glyph = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+    pygame.draw.circle(glyph, (brightness, brightness, brightness), (size, size), size)
+    return glyph.convert_alpha()
+
+
+# Star properties as arrays so parallax is computed for the whole field at once
+star_x = np.array([x for x, _, _ in stars], dtype=np.float32)
+star_y = np.array([y for _, y, _ in stars], dtype=np.float32)
+star_b = np.array([brightness for _, _, brightness in stars], dtype=np.float32)
+star_parallax = star_b / 255.0 * 0.1
+star_size = np.where(star_b >= 230, 2, 1).astype(np.int32)
+star_glyphs = [star_glyph(int(brightness), int(size))
+               for brightness, size in zip(star_b, star_size)]
+
+# pygame-ce batches same-source blits with fblits; plain pygame only has blits
+HAS_FBLITS = hasattr(pygame.Surface, "fblits")
+
+
+def blit_batch(target, blit_sequence):
+    if HAS_FBLITS:
+        target.fblits(blit_sequence)
+    else:
+        target.blits(blit_sequence, False)
+
+
 class ResourceManager:
     def __init__(self):
         self.images = {}
@@ -40,6 +87,8 @@ class ResourceManager:
         image = pygame.image.load(path)
         if size:
             image = pygame.transform.scale(image, size)
+        # Match the display pixel format so blits don't convert per pixel
+        image = image.convert_alpha()
         self.images[name] = image
         return image
 
@@ -91,35 +140,34 @@ class CelestialBody:
         self.radius = radius
         self.color = color
 
-        # Render surface cache
-        self.render_surfaces = {}
-
-    def get_render_surface(self, zoom):
-        # Use a more precise rounding to reduce surface regeneration
-        zoom_key = round(zoom, 3)
+        # Draw planet once at high resolution with slight transparency
+        self.base_sprite = pygame.Surface((512, 512), pygame.SRCALPHA)
+        pygame.draw.circle(self.base_sprite, self.color + (200,), (256, 256), 256)
+        self.base_sprite = self.base_sprite.convert_alpha()
 
-        # Check if surface for this zoom level exists
-        if zoom_key in self.render_surfaces:
-            return self.render_surfaces[zoom_key]
+        # Render surface cache, keyed by screen radius, most recently used last
+        self.render_surfaces = OrderedDict()
 
+    def get_render_surface(self, zoom_level):
         # Calculate screen radius
-        screen_radius = max(int(self.radius / WORLD_SCALE * zoom), 1)
+        screen_radius = max(int(self.radius / WORLD_SCALE * ZOOM_LEVELS[zoom_level]), 1)
 
-        # Create surface with alpha
-        surface = pygame.Surface((screen_radius * 2, screen_radius * 2), pygame.SRCALPHA)
+        # Check if surface for this screen radius exists
+        if screen_radius in self.render_surfaces:
+            self.render_surfaces.move_to_end(screen_radius)
+            return self.render_surfaces[screen_radius]
 
-        # Draw planet with slight transparency
-        pygame.draw.circle(surface, self.color + (200,),
-                           (screen_radius, screen_radius),
-                           screen_radius)
+        # Scale the high resolution sprite to the screen size
+        surface = pygame.transform.smoothscale(self.base_sprite,
+                                               (screen_radius * 2, screen_radius * 2))
 
         # Cache surface
-        self.render_surfaces[zoom_key] = surface
+        self.render_surfaces[screen_radius] = surface
 
         # Limit cache size
-        if len(self.render_surfaces) > 20:
+        if len(self.render_surfaces) > len(ZOOM_LEVELS):
             # Remove the least recently used surface
-            self.render_surfaces.pop(next(iter(self.render_surfaces)))
+            self.render_surfaces.popitem(last=False)
 
         return surface
 
@@ -128,8 +176,14 @@ class CelestialBody:
         screen_x = ((self.x / WORLD_SCALE - camera_pos[0]) * CAMERA_ZOOM) + HALF_WIDTH
         screen_y = ((self.y / WORLD_SCALE - camera_pos[1]) * CAMERA_ZOOM) + HALF_HEIGHT
 
+        # Skip bodies entirely outside the window before building a surface
+        screen_radius = self.radius / WORLD_SCALE * CAMERA_ZOOM
+        if (screen_x + screen_radius < 0 or screen_x - screen_radius > WINDOW_WIDTH or
+                screen_y + screen_radius < 0 or screen_y - screen_radius > WINDOW_HEIGHT):
+            return
+
         # Get render surface
-        planet_surface = self.get_render_surface(CAMERA_ZOOM)
+        planet_surface = self.get_render_surface(zoom_level)
 
         # Calculate precise blit position
         blit_x = int(screen_x - planet_surface.get_width() / 2)
@@ -138,31 +192,6 @@ class CelestialBody:
         # Blit planet with precise positioning
         surface.blit(planet_surface, (blit_x, blit_y))
 
-    def apply_gravity(self, obj):
-        # Calculate distance and direction in real coordinates
-        dx = self.x - obj.position[0] * WORLD_SCALE
-        dy = self.y - obj.position[1] * WORLD_SCALE
-        distance_squared = dx * dx + dy * dy
-        distance = math.sqrt(distance_squared)
-
-        # Don't apply gravity if inside the body
-        if distance < self.radius:
-            return
-
-        # Calculate gravitational force
-        force = G * self.mass * obj.mass / distance_squared
-
-        # Convert to acceleration
-        acc = force / obj.mass
-
-        # Break into components
-        acc_x = acc * dx / distance
-        acc_y = acc * dy / distance
-
-        # Apply acceleration over time step
-        obj.velocity[0] += (acc_x * TIME_STEP) / WORLD_SCALE
-        obj.velocity[1] += (acc_y * TIME_STEP) / WORLD_SCALE
-
 
 class Ship:
     def __init__(self):
@@ -170,6 +199,7 @@ class Ship:
         self.base_image = pygame.Surface((20, 20), pygame.SRCALPHA)
         pygame.draw.polygon(self.base_image, (255, 0, 0),
                             [(10, 0), (20, 20), (10, 15), (0, 20)])
+        self.base_image = self.base_image.convert_alpha()
 
         # Load Nixon image (optional: add error handling)
         try:
@@ -181,10 +211,10 @@ class Ship:
         # Current image
         self.current_image = self.base_image
 
-        # Rotated image cache
-        self.rotated_image = self.current_image
+        # Pre-rendered rotations of the current image, one per 5 degrees
+        self.build_rotations()
 
-        # Zoom-related attributes
+        # Rotated and scaled image cache, keyed by (angle, zoom)
         self.scaled_images = {}
 
         # Low Earth Orbit (LEO) parameters
@@ -203,41 +233,30 @@ class Ship:
         orbit_angle = math.pi / 4  # 45 degrees
 
         # Position calculation
-        self.position = [
+        self.position = np.array([
             (orbit_radius / WORLD_SCALE) * math.cos(orbit_angle),
             (orbit_radius / WORLD_SCALE) * math.sin(orbit_angle)
-        ]
+        ], dtype=np.float64)
 
         # Velocity calculation for circular orbit
         # Velocity is perpendicular to the position vector
         # Ensure tangential velocity for circular orbit
-        self.velocity = [
+        self.velocity = np.array([
             -orbital_velocity * math.sin(orbit_angle) / WORLD_SCALE,
             orbital_velocity * math.cos(orbit_angle) / WORLD_SCALE
-        ]
+        ], dtype=np.float64)
+
+        # Gravitational acceleration at the current position, carried between steps
+        self.acceleration = np.zeros(2, dtype=np.float64)
+        compute_gravity(self.position, self.acceleration,
+                        body_x, body_y, body_gm, body_radius, body_cutoff_sq)
 
         # Movement properties
-        self.angle = math.degrees(orbit_angle)
+        self.angle = round(math.degrees(orbit_angle))  # Whole degrees, indexes the trig tables
         self.main_thrust = 0.1
         self.rcs_thrust = 0.05
         self.mass = 1000  # kg
 
-    def check_planet_collision(self):
-        for body in celestial_bodies:
-            # Convert object's position to world coordinates
-            obj_x = self.position[0] * WORLD_SCALE
-            obj_y = self.position[1] * WORLD_SCALE
-
-            # Calculate distance between object and body center
-            dx = body.x - obj_x
-            dy = body.y - obj_y
-            distance = math.sqrt(dx * dx + dy * dy)
-
-            # Check if distance is less than the body's radius
-            if distance < body.radius:
-                return body
-        return None
-
     def toggle_nixon_mode(self):
         # Toggle between base image and Nixon image
         if self.current_image == self.base_image:
@@ -245,52 +264,61 @@ class Ship:
         else:
             self.current_image = self.base_image
 
-        # Reset rotated image when changing image
-        self.rotated_image = pygame.transform.rotate(self.current_image, -self.angle)
-        # Clear scaled images cache
+        # Re-render rotations and clear scaled images cache
+        self.build_rotations()
         self.scaled_images.clear()
 
+    def build_rotations(self):
+        # The ship only ever turns in 5 degree steps, so rotate each orientation once
+        self.rotations = [pygame.transform.rotate(self.current_image, -angle).convert_alpha()
+                          for angle in range(0, 360, 5)]
+
     def rotate(self, angle_change):
         self.angle = (self.angle + angle_change) % 360
-        self.rotated_image = pygame.transform.rotate(self.current_image, -self.angle)
-        # Clear scaled images cache when rotation changes
-        self.scaled_images.clear()
 
     def move_forward(self):
-        angle_rad = math.radians(self.angle)
-        self.velocity[0] += self.main_thrust * math.sin(angle_rad)
-        self.velocity[1] -= self.main_thrust * math.cos(angle_rad)
+        self.velocity[0] += self.main_thrust * SIN_DEG[self.angle]
+        self.velocity[1] -= self.main_thrust * COS_DEG[self.angle]
 
     def apply_rcs(self, dx, dy):
-        angle_rad = math.radians(self.angle)
-        rotated_dx = dx * math.cos(angle_rad) - dy * math.sin(angle_rad)
-        rotated_dy = dx * math.sin(angle_rad) + dy * math.cos(angle_rad)
+        sin_angle = SIN_DEG[self.angle]
+        cos_angle = COS_DEG[self.angle]
+        rotated_dx = dx * cos_angle - dy * sin_angle
+        rotated_dy = dx * sin_angle + dy * cos_angle
         self.velocity[0] += rotated_dx * self.rcs_thrust
         self.velocity[1] += rotated_dy * self.rcs_thrust
 
     def update(self):
-        # Apply gravity from celestial bodies
-        for body in celestial_bodies:
-            body.apply_gravity(self)
-
-        # Update position based on velocity
-        self.position[0] += self.velocity[0]
-        self.position[1] += self.velocity[1]
+        # Gravity, integration and collision detection run in the compiled physics kernel
+        collided = step(self.position, self.velocity, self.acceleration,
+                        body_x, body_y, body_gm, body_radius, body_cutoff_sq,
+                        TIME_STEP)
+
+        # Return the body the ship crashed into, if any
+        if collided >= 0:
+            return celestial_bodies[collided]
+        return None
 
     def draw(self, surface, camera_pos):
         # Calculate screen position with zoom
         screen_x = ((self.position[0] - camera_pos[0]) * CAMERA_ZOOM) + HALF_WIDTH
         screen_y = ((self.position[1] - camera_pos[1]) * CAMERA_ZOOM) + HALF_HEIGHT
 
-        # Always use the current image size, just rotate
-        rotated_image = pygame.transform.rotate(self.current_image, -self.angle)
-
-        # Scale the rotated image
-        scaled_image = pygame.transform.scale(
-            rotated_image,
-            (int(rotated_image.get_width() * CAMERA_ZOOM),
-             int(rotated_image.get_height() * CAMERA_ZOOM))
-        )
+        # Reuse the rotated and scaled image if this angle and zoom were drawn before
+        image_key = (self.angle, zoom_level)
+        scaled_image = self.scaled_images.get(image_key)
+        if scaled_image is None:
+            rotated_image = self.rotations[self.angle // 5]
+            scaled_image = pygame.transform.scale(
+                rotated_image,
+                (int(rotated_image.get_width() * CAMERA_ZOOM),
+                 int(rotated_image.get_height() * CAMERA_ZOOM))
+            )
+            self.scaled_images[image_key] = scaled_image
+
+            # Limit cache size
+            if len(self.scaled_images) > 64:
+                self.scaled_images.pop(next(iter(self.scaled_images)))
 
         # Calculate precise blit position
         blit_x = int(screen_x - scaled_image.get_width() / 2)
@@ -300,6 +328,57 @@ class Ship:
         surface.blit(scaled_image, (blit_x, blit_y))
 
 
+@njit(cache=True, fastmath=True)
+def compute_gravity(pos, acc, bx, by, bgm, bradius, bcutoff_sq):
+    # Index of the body the ship is inside, or -1
+    collided = -1
+    acc[0] = 0.0
+    acc[1] = 0.0
+
+    # Sum gravity from celestial bodies, working in world units
+    for j in range(bx.shape[0]):
+        # Calculate distance and direction
+        dx = bx[j] - pos[0]
+        dy = by[j] - pos[1]
+        distance_squared = dx * dx + dy * dy
+
+        # Too far away for the body's gravity to matter
+        if distance_squared > bcutoff_sq[j]:
+            continue
+
+        # Inside the body counts as a collision and gets no gravity
+        if distance_squared < bradius[j] * bradius[j]:
+            collided = j
+            continue
+
+        # Acceleration per unit of displacement: G * M / r^3
+        acc_factor = bgm[j] / (distance_squared * math.sqrt(distance_squared))
+        acc[0] += acc_factor * dx
+        acc[1] += acc_factor * dy
+
+    return collided
+
+
+@njit(cache=True, fastmath=True)
+def step(pos, vel, acc, bx, by, bgm, bradius, bcutoff_sq, time_step):
+    # Leapfrog (kick-drift-kick) integration. acc holds the acceleration at pos
+    # from the previous step, so gravity is only evaluated once per step
+    half_step = time_step * 0.5
+
+    # Half kick, then drift to the new position
+    vel[0] += acc[0] * half_step
+    vel[1] += acc[1] * half_step
+    pos[0] += vel[0]
+    pos[1] += vel[1]
+
+    # Gravity and collisions at the new position, then the closing half kick
+    collided = compute_gravity(pos, acc, bx, by, bgm, bradius, bcutoff_sq)
+    vel[0] += acc[0] * half_step
+    vel[1] += acc[1] * half_step
+
+    return collided
+
+
 def draw_minimap(surface, player_pos, zoom=0.01):
     # Create a small surface for the minimap
     minimap_size = 200
@@ -311,15 +390,15 @@ def draw_minimap(surface, player_pos, zoom=0.01):
 
     minimap_center = minimap_size // 2
 
-    # Draw celestial bodies on minimap
-    for body in celestial_bodies:
-        mini_x = int(minimap_center + (body.x / WORLD_SCALE - player_pos[0]) * zoom)
-        mini_y = int(minimap_center + (body.y / WORLD_SCALE - player_pos[1]) * zoom)
+    # Minimap positions of all celestial bodies at once
+    mini_xs = (minimap_center + (body_x - player_pos[0]) * zoom).astype(np.int32)
+    mini_ys = (minimap_center + (body_y - player_pos[1]) * zoom).astype(np.int32)
 
+    # Draw celestial bodies on minimap
+    for body, mini_x, mini_y, size in zip(celestial_bodies, mini_xs.tolist(),
+                                          mini_ys.tolist(), BODY_MINI_SIZE):
         # Only draw if within minimap bounds
         if 0 <= mini_x < minimap_size and 0 <= mini_y < minimap_size:
-            # Size based on mass
-            size = max(3, int(math.log10(body.mass) - 20))
             pygame.draw.circle(minimap, body.color, (mini_x, mini_y), size)
 
     # Draw player position (white dot)
@@ -363,6 +442,20 @@ MARS = CelestialBody(
 
 celestial_bodies = [EARTH, MOON, SUN, MARS]
 
+# Body properties in world units as arrays for the physics kernel
+body_x = np.array([body.x / WORLD_SCALE for body in celestial_bodies], dtype=np.float64)
+body_y = np.array([body.y / WORLD_SCALE for body in celestial_bodies], dtype=np.float64)
+body_gm = np.array([G * body.mass / WORLD_SCALE ** 3 for body in celestial_bodies],
+                   dtype=np.float64)
+body_radius = np.array([body.radius / WORLD_SCALE for body in celestial_bodies],
+                       dtype=np.float64)
+
+# Gravity is neglected beyond 1000 body radii
+body_cutoff_sq = (1000 * body_radius) ** 2
+
+# Minimap dot size for each body, based on mass
+BODY_MINI_SIZE = [max(3, int(math.log10(body.mass) - 20)) for body in celestial_bodies]
+
 # Create the ship
 player_ship = Ship()
 
@@ -372,112 +465,138 @@ sound_manager.load_sound('nixon mode', 'blip1.wav')
 # Precompute font
 font = pygame.font.Font(None, 24)
 
-# Game loop
-running = True
-clock = pygame.time.Clock()
-
-while running:
-    # Handle events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        # Nixon mode toggle
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_n:
-                player_ship.toggle_nixon_mode()
-                sound_manager.play_sound('nixon mode')
-
-            # Restart game if ship is destroyed and R is pressed
-            if game_over and event.key == pygame.K_r:
-                # Reset game state
-                player_ship = Ship()
-                game_over = False
-                CAMERA_ZOOM = 1.0
-
-    # Only process game logic if not game over
-    if not game_over:
-        # Handle continuous keyboard input
-        keys = pygame.key.get_pressed()
-
-        # Ship controls
-        if keys[pygame.K_LEFT]:
-            player_ship.rotate(-5)
-        if keys[pygame.K_RIGHT]:
-            player_ship.rotate(5)
-        if keys[pygame.K_UP]:
-            player_ship.move_forward()
-
-        # RCS controls
-        dx = 0
-        dy = 0
-        if keys[pygame.K_a]: dx = -1
-        if keys[pygame.K_d]: dx = 1
-        if keys[pygame.K_w]: dy = -1
-        if keys[pygame.K_s]: dy = 1
-        if dx != 0 or dy != 0:
-            player_ship.apply_rcs(dx, dy)
-
-        # Zoom controls
-        zoom_speed = 0.2  # Adjust for desired zoom smoothness
-        if keys[pygame.K_EQUALS] or keys[pygame.K_PLUS]:  # Zoom in
-            CAMERA_ZOOM *= 1 + zoom_speed
-        if keys[pygame.K_MINUS]:  # Zoom out
-            CAMERA_ZOOM /= 1 + zoom_speed
-
-        # Optional: Add zoom limits
-        CAMERA_ZOOM = max(0.1, min(CAMERA_ZOOM, 10))  # Limit zoom between 0.1 and 10
-
-        # Update ship
-        player_ship.update()
-
-        # Check for planet collision
-        collided_body = player_ship.check_planet_collision()
-        if collided_body:
-            game_over = True
-            print(f"Ship crashed into {collided_body.color} planet!")
-
-    # Clear the window
-    window.fill((0, 0, 0))
-
-    # Draw starfield with parallax
-    for x, y, brightness in stars:
-        parallax = brightness / 255.0
-        star_x = int((x - player_ship.position[0] * parallax * 0.1) % WINDOW_WIDTH)
-        star_y = int((y - player_ship.position[1] * parallax * 0.1) % WINDOW_HEIGHT)
-        color = (brightness, brightness, brightness)
-        size = 1 if brightness < 230 else 2
-        pygame.draw.circle(window, color, (star_x, star_y), size)
-
-    # Draw celestial bodies
-    for body in celestial_bodies:
-        body.draw(window, player_ship.position)
-
-    # Draw ship
-    player_ship.draw(window, player_ship.position)
-
-    # Draw minimap
-    draw_minimap(window, player_ship.position)
-
-    # Draw debug info
-    speed = math.sqrt(player_ship.velocity[0] ** 2 + player_ship.velocity[1] ** 2) * WORLD_SCALE / 1000
-    speed_text = font.render(f"Speed: {speed:.1f} km/s Zoom: {CAMERA_ZOOM:.2f}", True, (255, 255, 255))
-    window.blit(speed_text, (10, 10))
-
-    # Draw game over text if game is over
-    if game_over:
-        game_over_font = pygame.font.Font(None, 74)
-        game_over_text = game_over_font.render("GAME OVER", True, (255, 0, 0))
-        game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
-        window.blit(game_over_text, game_over_rect)
-
-        restart_font = pygame.font.Font(None, 36)
-        restart_text = restart_font.render("Press R to Restart", True, (255, 255, 255))
-        restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 100))
-        window.blit(restart_text, restart_rect)
-
-    # Update the display
-    pygame.display.flip()
-    clock.tick(60)
-
-pygame.quit()
+# Rendered HUD text, keyed by the displayed string
+_hud_cache = {}
+
+def main():
+    global game_over, player_ship, zoom_level, CAMERA_ZOOM
+
+    # Bind functions called every frame as locals to skip global lookups
+    event_get = pygame.event.get
+    event_clear = pygame.event.clear
+    get_pressed = pygame.key.get_pressed
+    flip = pygame.display.flip
+    sqrt = math.sqrt
+    blit = window.blit
+
+    # Event types the loop reacts to; everything else is discarded
+    handled_events = [pygame.QUIT, pygame.KEYDOWN]
+
+    # Game loop
+    running = True
+    clock = pygame.time.Clock()
+    tick = clock.tick
+
+    while running:
+        # Handle events, letting pygame filter out the types we ignore
+        for event in event_get(handled_events):
+            if event.type == pygame.QUIT:
+                running = False
+
+            # Nixon mode toggle
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_n:
+                    player_ship.toggle_nixon_mode()
+                    sound_manager.play_sound('nixon mode')
+
+                # Restart game if ship is destroyed and R is pressed
+                if game_over and event.key == pygame.K_r:
+                    # Reset game state
+                    player_ship = Ship()
+                    game_over = False
+                    zoom_level = DEFAULT_ZOOM_LEVEL
+                    CAMERA_ZOOM = ZOOM_LEVELS[zoom_level]
+
+        # Drop the unhandled events left in the queue
+        event_clear(pump=False)
+
+        # Only process game logic if not game over
+        if not game_over:
+            # Handle continuous keyboard input
+            keys = get_pressed()
+
+            # Ship controls
+            if keys[pygame.K_LEFT]:
+                player_ship.rotate(-5)
+            if keys[pygame.K_RIGHT]:
+                player_ship.rotate(5)
+            if keys[pygame.K_UP]:
+                player_ship.move_forward()
+
+            # RCS controls
+            dx = 0
+            dy = 0
+            if keys[pygame.K_a]: dx = -1
+            if keys[pygame.K_d]: dx = 1
+            if keys[pygame.K_w]: dy = -1
+            if keys[pygame.K_s]: dy = 1
+            if dx != 0 or dy != 0:
+                player_ship.apply_rcs(dx, dy)
+
+            # Zoom controls
+            if keys[pygame.K_EQUALS] or keys[pygame.K_PLUS]:  # Zoom in
+                zoom_level = min(zoom_level + 1, len(ZOOM_LEVELS) - 1)
+            if keys[pygame.K_MINUS]:  # Zoom out
+                zoom_level = max(zoom_level - 1, 0)
+            CAMERA_ZOOM = ZOOM_LEVELS[zoom_level]
+
+            # Update ship and check for planet collision
+            collided_body = player_ship.update()
+            if collided_body:
+                game_over = True
+                print(f"Ship crashed into {collided_body.color} planet!")
+
+        # Clear the window
+        window.fill((0, 0, 0))
+
+        # Draw starfield with parallax as a single batched blit
+        screen_xs = (star_x - player_ship.position[0] * star_parallax) % WINDOW_WIDTH
+        screen_ys = (star_y - player_ship.position[1] * star_parallax) % WINDOW_HEIGHT
+        screen_xs = screen_xs.astype(np.int32) - star_size
+        screen_ys = screen_ys.astype(np.int32) - star_size
+        blit_batch(window, list(zip(star_glyphs, zip(screen_xs.tolist(), screen_ys.tolist()))))
+
+        # Draw celestial bodies
+        for body in celestial_bodies:
+            body.draw(window, player_ship.position)
+
+        # Draw ship
+        player_ship.draw(window, player_ship.position)
+
+        # Draw minimap
+        draw_minimap(window, player_ship.position)
+
+        # Draw debug info
+        speed = sqrt(player_ship.velocity[0] ** 2 + player_ship.velocity[1] ** 2) * WORLD_SCALE / 1000
+        hud_string = f"Speed: {speed:.1f} km/s Zoom: {CAMERA_ZOOM:.2f}"
+        speed_text = _hud_cache.get(hud_string)
+        if speed_text is None:
+            speed_text = font.render(hud_string, True, (255, 255, 255))
+            _hud_cache[hud_string] = speed_text
+
+            # Limit cache size
+            if len(_hud_cache) > 128:
+                _hud_cache.pop(next(iter(_hud_cache)))
+        blit(speed_text, (10, 10))
+
+        # Draw game over text if game is over
+        if game_over:
+            game_over_font = pygame.font.Font(None, 74)
+            game_over_text = game_over_font.render("GAME OVER", True, (255, 0, 0))
+            game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
+            blit(game_over_text, game_over_rect)
+
+            restart_font = pygame.font.Font(None, 36)
+            restart_text = restart_font.render("Press R to Restart", True, (255, 255, 255))
+            restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 100))
+            blit(restart_text, restart_rect)
+
+        # Update the display
+        flip()
+        tick(60)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()